@@ -2,14 +2,13 @@ import asyncio
 import logging
 from typing import TYPE_CHECKING
 
-import sentry_sdk
 import uvloop
 from bs_config import Env
 
 from bot import rules
 from bot.config import Config, StateConfig
 from bot.rule_state import RuleState
-from bot.telegram_bot import TelegramBot
+from bot.startup_profile import StartupProfile
 
 if TYPE_CHECKING:
     from pathlib import Path
@@ -18,28 +17,21 @@ _LOG = logging.getLogger("bot")
 
 
 async def _init_rules(
-    state_config: StateConfig | None, rules_env: Env
+    state_config: StateConfig | None, rules_env: Env, profile: StartupProfile
 ) -> list[RuleState]:
-    rule_classes = [
-        rules.DartsRule,
-        rules.LemonRule,
-        rules.PremiumRule,
-        rules.SlashRule,
-    ]
-
-    initialized_rules = [
-        RuleClass(  # type: ignore[abstract]
-            rules_env / RuleClass.name(),
+    with profile.phase("rules"):
+        initialized_rules = rules.load_enabled_rules(rules_env)
+
+    with profile.phase("state"):
+        return list(
+            filter(
+                None,
+                [
+                    await RuleState.load(rule, state_config)
+                    for rule in initialized_rules
+                ],
+            )
         )
-        for RuleClass in rule_classes
-    ]
-
-    return list(
-        filter(
-            None,
-            [await RuleState.load(rule, state_config) for rule in initialized_rules],
-        )
-    )
 
 
 def _setup_logging():
@@ -53,15 +45,34 @@ def _setup_sentry(config: Config):
         _LOG.warning("Sentry DSN not found")
         return
 
+    import sentry_sdk
+    from sentry_sdk.integrations.httpx import HttpxIntegration
+
     sentry_sdk.init(
         dsn,
         release=config.app_version,
+        traces_sample_rate=config.sentry_traces_sample_rate,
+        # Telegram API URLs contain the bot token. The integration would record
+        # them in spans and in breadcrumbs, so it stays disabled even if tracing
+        # is off, at the cost of httpx breadcrumbs in error reports. Outgoing
+        # requests are traced by the bot's request class instead.
+        disabled_integrations=[HttpxIntegration()],
     )
 
 
-async def _run_telegram_bot(config: Config, rules_env: Env) -> None:
-    rule_states = await _init_rules(config.state, rules_env)
-    bot = TelegramBot(config, rule_states)
+async def _run_telegram_bot(
+    config: Config, rules_env: Env, profile: StartupProfile
+) -> None:
+    rule_states = await _init_rules(config.state, rules_env, profile)
+
+    with profile.phase("bot"):
+        from bot.telegram_bot import TelegramBot
+
+        bot = TelegramBot(config, rule_states)
+
+    if config.profile_startup:
+        profile.report()
+
     try:
         await bot.run()
     finally:
@@ -90,13 +101,19 @@ def _load_rules_env(config_dir: Path) -> Env:
 
 
 def main() -> None:
+    profile = StartupProfile()
     _setup_logging()
-    config = _load_config()
-    _setup_sentry(config)
 
-    rules_env = _load_rules_env(config.config_dir)
+    with profile.phase("config"):
+        config = _load_config()
+
+    with profile.phase("sentry"):
+        _setup_sentry(config)
+
+    with profile.phase("rules config"):
+        rules_env = _load_rules_env(config.config_dir)
 
-    uvloop.run(_run_telegram_bot(config, rules_env))
+    uvloop.run(_run_telegram_bot(config, rules_env, profile))
 
 
 if __name__ == "__main__":
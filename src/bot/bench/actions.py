@@ -0,0 +1,123 @@
+"""Measures outgoing Telegram action throughput against a local stub API.
+
+The bot's HTTP client is configured from the same TELEGRAM_HTTP__* environment
+variables as in production, so pool settings can be compared without touching
+the real Telegram API.
+"""
+
+import argparse
+import asyncio
+import itertools
+import logging
+import statistics
+import time
+
+import telegram
+from bs_config import Env
+from telegram.error import TelegramError
+
+from bot.bench.telegram_stub import StubTelegramServer
+from bot.config import TelegramHttpConfig
+from bot.telegram_bot import create_request
+from bot.tracing import Tracer
+
+_LOG = logging.getLogger(__name__)
+
+_CHAT_ID = -1001234567890
+_USER_ID = 123456789
+
+
+async def _send_action(bot: telegram.Bot, index: int) -> None:
+    match index % 3:
+        case 0:
+            await bot.delete_message(chat_id=_CHAT_ID, message_id=index)
+        case 1:
+            await bot.ban_chat_member(chat_id=_CHAT_ID, user_id=_USER_ID)
+        case _:
+            await bot.send_message(
+                chat_id=_CHAT_ID,
+                text="stats",
+                reply_to_message_id=index,
+            )
+
+
+async def _run(
+    *,
+    config: TelegramHttpConfig,
+    request_count: int,
+    concurrency: int,
+    latency: float,
+) -> None:
+    async with StubTelegramServer(latency=latency) as server:
+        bot = telegram.Bot(
+            token="123456:bench",
+            base_url=server.base_url,
+            request=create_request(
+                config.actions,
+                tracer=Tracer(enabled=False),
+            ),
+        )
+
+        latencies: list[float] = []
+        errors = 0
+        indices = itertools.count()
+
+        async def _worker() -> None:
+            nonlocal errors
+            while (index := next(indices)) < request_count:
+                start = time.perf_counter()
+                try:
+                    await _send_action(bot, index)
+                except TelegramError as e:
+                    _LOG.debug("Action failed", exc_info=e)
+                    errors += 1
+                else:
+                    latencies.append(time.perf_counter() - start)
+
+        async with bot:
+            start = time.perf_counter()
+            async with asyncio.TaskGroup() as tg:
+                for _ in range(concurrency):
+                    tg.create_task(_worker())
+            duration = time.perf_counter() - start
+
+    quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else []
+    _LOG.info(
+        "%d actions (%d failed) in %.2f s: %.0f actions/s",
+        request_count,
+        errors,
+        duration,
+        request_count / duration,
+    )
+    if quantiles:
+        _LOG.info(
+            "Latency p50 %.1f ms, p95 %.1f ms, p99 %.1f ms",
+            quantiles[49] * 1000,
+            quantiles[94] * 1000,
+            quantiles[98] * 1000,
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=10_000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    config = TelegramHttpConfig.from_env(Env.load() / "telegram-http")
+    _LOG.info("Using HTTP config %s", config)
+
+    asyncio.run(
+        _run(
+            config=config,
+            request_count=args.requests,
+            concurrency=args.concurrency,
+            latency=args.latency_ms / 1000,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,401 @@
+"""Soak test that drives synthetic updates through the bot's update handler.
+
+Rules run with in-memory state and a stubbed Telegram API. While running, the
+RSS, traced Python memory, state blob sizes and per-update latencies are sampled.
+The resulting report is written as JSON, and the process exits with a non-zero
+status if memory or latency grew beyond the given thresholds.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import resource
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import telegram
+from bs_config import Env
+
+from bot import rules
+from bot.bench.telegram_stub import StubRequest
+from bot.config import Config, StateConfig, TelegramHttpConfig
+from bot.rule_state import RuleState
+from bot.telegram_bot import TelegramBot
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+_LOG = logging.getLogger(__name__)
+
+_USER_ID_OFFSET = 100_000
+_CHAT_ID_OFFSET = -1_000_000_000_000
+
+
+@dataclass(frozen=True, kw_only=True)
+class _Options:
+    update_count: int
+    sample_every: int
+    chat_count: int
+    user_count: int
+    seconds_per_update: float
+    config_dir: Path | None
+    trace_memory: bool
+    top_allocators: int
+    max_rss_growth: float
+    max_latency_drift: float
+    report_path: Path
+    seed: int
+
+
+@dataclass(frozen=True, kw_only=True)
+class _Sample:
+    update_count: int
+    elapsed_seconds: float
+    rss_kib: int
+    traced_kib: int | None
+    state_bytes_by_rule: dict[str, int]
+    latency_p50_ms: float
+    latency_p99_ms: float
+    latency_max_ms: float
+
+
+@dataclass(kw_only=True)
+class _Report:
+    options: dict[str, Any]
+    samples: list[_Sample] = field(default_factory=list)
+    top_allocators: list[str] = field(default_factory=list)
+    failures: list[str] = field(default_factory=list)
+
+
+def _synthetic_config(chat_ids: Sequence[int], user_ids: Sequence[int]) -> str:
+    chat_list = ", ".join(str(chat_id) for chat_id in chat_ids)
+    lines = [
+        "[rule.darts]",
+        f"enabled-chats = [{chat_list}]",
+    ]
+    for chat_id in chat_ids:
+        members = ", ".join(str(user_id) for user_id in user_ids[:4])
+        lines.extend(
+            [
+                f"[rule.darts.{chat_id}]",
+                'emojis = ["🎯"]',
+                'groups = ["soak"]',
+                f"[rule.darts.{chat_id}.group.soak]",
+                f"members = [{members}]",
+            ]
+        )
+
+    for name in ["banned-media", "command-spam", "lemons"]:
+        lines.extend([f"[rule.{name}]", f"enabled-chats = [{chat_list}]"])
+        if name == "banned-media":
+            lines.append('file-unique-ids = ["banned-0"]')
+
+    return "\n".join(lines) + "\n"
+
+
+def _load_rules_env(options: _Options, temp_dir: Path) -> Env:
+    if config_dir := options.config_dir:
+        toml_paths = sorted(config_dir.glob("*.toml"))
+    else:
+        chat_ids = [_CHAT_ID_OFFSET - index for index in range(options.chat_count)]
+        user_ids = [_USER_ID_OFFSET + index for index in range(options.user_count)]
+        config_path = temp_dir / "soak.toml"
+        config_path.write_text(_synthetic_config(chat_ids, user_ids))
+        toml_paths = [config_path]
+
+    return Env.load(toml_configs=toml_paths) / "rule"
+
+
+class _UpdateFactory:
+    def __init__(self, options: _Options) -> None:
+        self._random = random.Random(options.seed)
+        self._chat_count = options.chat_count
+        self._user_count = options.user_count
+        self._seconds_per_update = options.seconds_per_update
+        self._start = datetime(2025, 1, 1, tzinfo=UTC)
+        self._update_id = 0
+
+    def _content(self) -> dict[str, Any]:
+        roll = self._random.random()
+        if roll < 0.5:
+            return {"dice": {"emoji": "🎯", "value": self._random.randint(1, 6)}}
+        if roll < 0.6:
+            return {"dice": {"emoji": "🎰", "value": self._random.randint(1, 64)}}
+        if roll < 0.65:
+            return {"text": "/stats"}
+        if roll < 0.7:
+            return {"text": "/start"}
+        if roll < 0.8:
+            file_unique_id = f"banned-{self._random.randrange(20)}"
+            return {
+                "photo": [
+                    {
+                        "file_id": file_unique_id,
+                        "file_unique_id": file_unique_id,
+                        "width": 90,
+                        "height": 90,
+                    }
+                ]
+            }
+
+        return {"text": "soak"}
+
+    def create(self, bot: telegram.Bot) -> telegram.Update:
+        self._update_id += 1
+        date = self._start + timedelta(
+            seconds=self._update_id * self._seconds_per_update
+        )
+        user_id = _USER_ID_OFFSET + self._random.randrange(self._user_count)
+        message = {
+            "message_id": self._update_id,
+            "date": int(date.timestamp()),
+            "chat": {
+                "id": _CHAT_ID_OFFSET - self._random.randrange(self._chat_count),
+                "type": "supergroup",
+            },
+            "from": {
+                "id": user_id,
+                "is_bot": False,
+                "first_name": f"User {user_id}",
+            },
+            **self._content(),
+        }
+        return telegram.Update.de_json(
+            {"update_id": self._update_id, "message": message},
+            bot,
+        )
+
+
+def _current_rss_kib() -> int:
+    try:
+        statm = Path("/proc/self/statm").read_text().split()
+    except OSError:
+        # Not Linux, fall back to the peak RSS
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    return int(statm[1]) * resource.getpagesize() // 1024
+
+
+async def _state_sizes(rule_states: Sequence[RuleState]) -> dict[str, int]:
+    sizes = {}
+    for rule_state in rule_states:
+        if (storage := rule_state.state_storage) is not None:
+            state = await storage.load()
+            sizes[rule_state.rule.name()] = len(state.model_dump_json())
+
+    return sizes
+
+
+def _take_sample(
+    *,
+    update_count: int,
+    start: float,
+    latencies: list[float],
+    state_sizes: dict[str, int],
+) -> _Sample:
+    percentiles = statistics.quantiles(latencies, n=100)
+    traced_kib = None
+    if tracemalloc.is_tracing():
+        traced_kib = tracemalloc.get_traced_memory()[0] // 1024
+
+    return _Sample(
+        update_count=update_count,
+        elapsed_seconds=time.perf_counter() - start,
+        rss_kib=_current_rss_kib(),
+        traced_kib=traced_kib,
+        state_bytes_by_rule=state_sizes,
+        latency_p50_ms=percentiles[49] * 1000,
+        latency_p99_ms=percentiles[98] * 1000,
+        latency_max_ms=max(latencies) * 1000,
+    )
+
+
+def _check_growth(options: _Options, report: _Report) -> None:
+    # The first sample is taken after warming up, so it's the baseline
+    if len(report.samples) < 2:
+        report.failures.append("Not enough samples to detect growth")
+        return
+
+    first = report.samples[0]
+    last = report.samples[-1]
+
+    rss_growth = (last.rss_kib - first.rss_kib) / first.rss_kib
+    if rss_growth > options.max_rss_growth:
+        report.failures.append(
+            f"RSS grew by {rss_growth:.1%} ({first.rss_kib} KiB to {last.rss_kib} KiB)"
+        )
+
+    latency_drift = (last.latency_p50_ms - first.latency_p50_ms) / max(
+        first.latency_p50_ms, 0.001
+    )
+    if latency_drift > options.max_latency_drift:
+        report.failures.append(
+            f"Median latency grew by {latency_drift:.1%}"
+            f" ({first.latency_p50_ms:.3f} ms to {last.latency_p50_ms:.3f} ms)"
+        )
+
+
+async def _run(options: _Options, report: _Report) -> None:
+    with tempfile.TemporaryDirectory() as temp_dir:
+        rules_env = _load_rules_env(options, Path(temp_dir))
+        enabled_rules = rules.load_enabled_rules(rules_env)
+
+    rule_states = [
+        rule_state
+        for rule in enabled_rules
+        if (rule_state := await RuleState.load(rule, None)) is not None
+    ]
+    config = Config(
+        app_version="soak",
+        config_dir=Path(),
+        nats=None,
+        profile_startup=False,
+        sentry_dsn=None,
+        sentry_traces_sample_rate=None,
+        state=StateConfig(redis=None),
+        telegram_http=TelegramHttpConfig.from_env(Env.load() / "telegram-http"),
+        telegram_token="123456:soak",
+    )
+    bot = TelegramBot(config, rule_states)
+    stub_bot = telegram.Bot(
+        token=config.telegram_token,
+        request=StubRequest(),
+        get_updates_request=StubRequest(),
+    )
+    updates = _UpdateFactory(options)
+
+    if options.trace_memory:
+        tracemalloc.start()
+    baseline_snapshot = None
+
+    latencies: list[float] = []
+    start = time.perf_counter()
+    async with stub_bot:
+        for update_count in range(1, options.update_count + 1):
+            update = updates.create(stub_bot)
+            update_start = time.perf_counter()
+            await bot._on_message(update, None)
+            latencies.append(time.perf_counter() - update_start)
+
+            if update_count % options.sample_every == 0:
+                sample = _take_sample(
+                    update_count=update_count,
+                    start=start,
+                    latencies=latencies,
+                    state_sizes=await _state_sizes(rule_states),
+                )
+                report.samples.append(sample)
+                latencies.clear()
+                _LOG.info(
+                    "%d updates, RSS %d KiB, p50 %.3f ms, p99 %.3f ms, state %s",
+                    update_count,
+                    sample.rss_kib,
+                    sample.latency_p50_ms,
+                    sample.latency_p99_ms,
+                    sample.state_bytes_by_rule,
+                )
+
+                if tracemalloc.is_tracing() and baseline_snapshot is None:
+                    baseline_snapshot = tracemalloc.take_snapshot()
+
+    if baseline_snapshot is not None:
+        snapshot = tracemalloc.take_snapshot()
+        stats = snapshot.compare_to(baseline_snapshot, "lineno")
+        report.top_allocators = [str(stat) for stat in stats[: options.top_allocators]]
+        tracemalloc.stop()
+
+    for rule_state in rule_states:
+        if (storage := rule_state.state_storage) is not None:
+            await storage.close()
+
+    _check_growth(options, report)
+
+
+def _parse_options() -> _Options:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--updates", type=int, default=1_000_000)
+    parser.add_argument("--sample-every", type=int, default=10_000)
+    parser.add_argument("--chats", type=int, default=5)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument(
+        "--seconds-per-update",
+        type=float,
+        default=10.0,
+        help="Simulated time between two updates",
+    )
+    parser.add_argument(
+        "--config-dir",
+        type=Path,
+        help="Use the rule config in this directory instead of a synthetic one",
+    )
+    parser.add_argument(
+        "--trace-memory",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+    )
+    parser.add_argument("--top-allocators", type=int, default=15)
+    parser.add_argument(
+        "--max-rss-growth",
+        type=float,
+        default=0.25,
+        help="Allowed relative RSS growth between the first and last sample",
+    )
+    parser.add_argument(
+        "--max-latency-drift",
+        type=float,
+        default=0.5,
+        help="Allowed relative median latency growth between first and last sample",
+    )
+    parser.add_argument("--report", type=Path, default=Path("soak-report.json"))
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    if args.sample_every < 2:
+        # Latency percentiles need at least two data points per sample
+        parser.error("--sample-every must be at least 2")
+
+    return _Options(
+        update_count=args.updates,
+        sample_every=args.sample_every,
+        chat_count=args.chats,
+        user_count=args.users,
+        seconds_per_update=args.seconds_per_update,
+        config_dir=args.config_dir,
+        trace_memory=args.trace_memory,
+        top_allocators=args.top_allocators,
+        max_rss_growth=args.max_rss_growth,
+        max_latency_drift=args.max_latency_drift,
+        report_path=args.report,
+        seed=args.seed,
+    )
+
+
+def main() -> None:
+    options = _parse_options()
+    logging.basicConfig(level=logging.WARNING)
+    _LOG.setLevel(logging.INFO)
+
+    report = _Report(
+        options={key: str(value) for key, value in asdict(options).items()},
+    )
+    asyncio.run(_run(options, report))
+
+    options.report_path.write_text(json.dumps(asdict(report), indent=2))
+    _LOG.info("Wrote report to %s", options.report_path)
+
+    if report.failures:
+        for failure in report.failures:
+            _LOG.error("Soak test failed: %s", failure)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
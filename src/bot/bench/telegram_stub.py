@@ -0,0 +1,209 @@
+"""A minimal local stand-in for the Telegram Bot API.
+
+Every API method succeeds. Methods that return messages get a synthetic message
+in the requested chat, everything else returns ``true``. The API is available as
+an HTTP server (plain HTTP/1.1 with keep-alive) to benchmark the bot's HTTP
+client, and as an in-process request class for benchmarks that should not
+measure networking at all.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import time
+from typing import TYPE_CHECKING, Any, Self
+from urllib.parse import parse_qs
+
+from telegram.request import BaseRequest
+
+if TYPE_CHECKING:
+    from telegram.request import RequestData
+
+_LOG = logging.getLogger(__name__)
+
+_MESSAGE_METHODS = frozenset(
+    {
+        "sendAnimation",
+        "sendDocument",
+        "sendMessage",
+        "sendPhoto",
+        "sendSticker",
+    }
+)
+
+_message_ids = itertools.count(1)
+
+
+def stub_result(api_method: str, params: dict[str, str]) -> Any:
+    if api_method == "getMe":
+        return {
+            "id": 1,
+            "is_bot": True,
+            "first_name": "Stub",
+            "username": "stub_bot",
+        }
+
+    if api_method in _MESSAGE_METHODS:
+        return {
+            "message_id": next(_message_ids),
+            "date": int(time.time()),
+            "chat": {
+                "id": int(params.get("chat_id", 0)),
+                "type": "supergroup",
+            },
+            "text": params.get("text", ""),
+        }
+
+    return True
+
+
+def _stub_response(api_method: str, params: dict[str, str]) -> bytes:
+    return json.dumps({"ok": True, "result": stub_result(api_method, params)}).encode()
+
+
+def _parse_params(content_type: str, body: bytes) -> dict[str, str]:
+    if content_type.startswith("application/x-www-form-urlencoded"):
+        return {key: values[0] for key, values in parse_qs(body.decode()).items()}
+
+    if content_type.startswith("application/json"):
+        return {key: str(value) for key, value in json.loads(body).items()}
+
+    return {}
+
+
+class StubTelegramServer:
+    def __init__(self, *, latency: float = 0.0) -> None:
+        self._latency = latency
+        self._server: asyncio.Server | None = None
+        self.request_count = 0
+
+    @property
+    def port(self) -> int:
+        if self._server is None:
+            raise ValueError("Server is not running")
+
+        return self._server.sockets[0].getsockname()[1]
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}/bot"
+
+    async def start(self, port: int = 0) -> None:
+        self._server = await asyncio.start_server(
+            self._handle_connection,
+            host="127.0.0.1",
+            port=port,
+        )
+        _LOG.info("Stub Telegram API listening on %s", self.base_url)
+
+    async def close(self) -> None:
+        if server := self._server:
+            server.close()
+            await server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self) -> Self:
+        await self.start()
+        return self
+
+    async def __aexit__(self, *_: Any) -> None:
+        await self.close()
+
+    async def _handle_connection(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ) -> None:
+        try:
+            while await self._handle_request(reader, writer):
+                pass
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _handle_request(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ) -> bool:
+        request_line = await reader.readline()
+        if not request_line:
+            return False
+
+        _, path, _ = request_line.decode().split(" ", maxsplit=2)
+        headers = {}
+        while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+            name, _, value = line.decode().partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        body = await reader.readexactly(int(headers.get("content-length", 0)))
+        params = _parse_params(headers.get("content-type", ""), body)
+        api_method = path.rsplit("/", maxsplit=1)[-1]
+
+        if self._latency:
+            await asyncio.sleep(self._latency)
+
+        self.request_count += 1
+        response = _stub_response(api_method, params)
+        writer.write(
+            b"HTTP/1.1 200 OK\r\n"
+            b"Content-Type: application/json\r\n"
+            b"Content-Length: " + str(len(response)).encode() + b"\r\n"
+            b"\r\n" + response
+        )
+        await writer.drain()
+        return headers.get("connection", "").lower() != "close"
+
+
+class StubRequest(BaseRequest):
+    def __init__(self) -> None:
+        self.request_count = 0
+
+    @property
+    def read_timeout(self) -> float | None:
+        return None
+
+    async def initialize(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        pass
+
+    async def do_request(
+        self,
+        url: str,
+        method: str,
+        request_data: RequestData | None = None,
+        *args: Any,
+        **kwargs: Any,
+    ) -> tuple[int, bytes]:
+        self.request_count += 1
+        params = request_data.json_parameters if request_data else {}
+        api_method = url.rsplit("/", maxsplit=1)[-1]
+        return 200, _stub_response(api_method, params)
+
+
+async def _serve(port: int, latency: float) -> None:
+    server = StubTelegramServer(latency=latency)
+    await server.start(port)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_serve(args.port, args.latency_ms / 1000))
+
+
+if __name__ == "__main__":
+    main()
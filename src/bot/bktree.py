@@ -0,0 +1,81 @@
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+class _Node:
+    __slots__ = ("children", "value")
+
+    def __init__(self, value: int) -> None:
+        self.value = value
+        self.children: dict[int, _Node] = {}
+
+
+class BKTree:
+    """Indexes integer hashes for lookups by Hamming distance.
+
+    A lookup only descends into subtrees whose edge distance is within the
+    searched radius of the query's distance to the node, so searching for near
+    duplicates with a small radius visits a small fraction of the entries.
+    """
+
+    def __init__(self, values: Iterable[int] = ()) -> None:
+        self._root: _Node | None = None
+        self._size = 0
+        for value in values:
+            self.add(value)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, value: int) -> None:
+        if self._root is None:
+            self._root = _Node(value)
+            self._size = 1
+            return
+
+        node = self._root
+        while True:
+            distance = hamming_distance(value, node.value)
+            if distance == 0:
+                return
+
+            child = node.children.get(distance)
+            if child is None:
+                node.children[distance] = _Node(value)
+                self._size += 1
+                return
+
+            node = child
+
+    def find(self, value: int, max_distance: int) -> int | None:
+        """Returns the closest indexed value within max_distance, if any."""
+        if self._root is None:
+            return None
+
+        best: int | None = None
+        best_distance = max_distance + 1
+        candidates = [self._root]
+        while candidates:
+            node = candidates.pop()
+            distance = hamming_distance(value, node.value)
+            if distance < best_distance:
+                best = node.value
+                best_distance = distance
+                if distance == 0:
+                    break
+
+            # Only values closer than the current best are still of interest
+            radius = best_distance - 1
+            low = distance - radius
+            high = distance + radius
+            candidates.extend(
+                child for edge, child in node.children.items() if low <= edge <= high
+            )
+
+        return best
@@ -1,7 +1,7 @@
 import logging
 from dataclasses import dataclass
 from pathlib import Path
-from typing import TYPE_CHECKING, Self
+from typing import TYPE_CHECKING, Literal, Self, overload
 
 from bs_nats_updater import NatsConfig
 
@@ -11,6 +11,35 @@ if TYPE_CHECKING:
 _LOG = logging.getLogger(__name__)
 
 
+@overload
+def _get_float(env: Env, key: str) -> float | None: ...
+
+
+@overload
+def _get_float(env: Env, key: str, *, default: float) -> float: ...
+
+
+def _get_float(env: Env, key: str, *, default: float | None = None) -> float | None:
+    value = env.get_string(key)
+    if value is None:
+        return default
+
+    return float(value)
+
+
+type HttpVersion = Literal["1.1", "2"]
+
+
+def _get_http_version(env: Env) -> HttpVersion:
+    match env.get_string("http-version", default="1.1"):
+        case "1.1":
+            return "1.1"
+        case "2":
+            return "2"
+        case other:
+            raise ValueError(f"Unsupported HTTP version: {other}")
+
+
 @dataclass
 class RedisStateConfig:
     host: str
@@ -47,22 +76,74 @@ class StateConfig:
         )
 
 
+@dataclass
+class HttpPoolConfig:
+    http_version: HttpVersion
+    pool_size: int
+    keepalive_connections: int
+    keepalive_expiry: float
+    connect_timeout: float
+    read_timeout: float
+    write_timeout: float
+    pool_timeout: float
+
+    @classmethod
+    def from_env(cls, env: Env, *, default_pool_size: int) -> Self:
+        pool_size = env.get_int("pool-size", default=default_pool_size)
+        return cls(
+            http_version=_get_http_version(env),
+            pool_size=pool_size,
+            keepalive_connections=env.get_int(
+                "keepalive-connections", default=pool_size
+            ),
+            keepalive_expiry=_get_float(env, "keepalive-expiry-seconds", default=30.0),
+            connect_timeout=_get_float(env, "connect-timeout-seconds", default=5.0),
+            read_timeout=_get_float(env, "read-timeout-seconds", default=5.0),
+            write_timeout=_get_float(env, "write-timeout-seconds", default=5.0),
+            pool_timeout=_get_float(env, "pool-timeout-seconds", default=1.0),
+        )
+
+
+@dataclass
+class TelegramHttpConfig:
+    # Used for everything except getUpdates, i.e. deletes, bans and replies
+    actions: HttpPoolConfig
+    updates: HttpPoolConfig
+
+    @classmethod
+    def from_env(cls, env: Env) -> Self:
+        return cls(
+            actions=HttpPoolConfig.from_env(env / "actions", default_pool_size=256),
+            updates=HttpPoolConfig.from_env(env / "updates", default_pool_size=1),
+        )
+
+
 @dataclass
 class Config:
     app_version: str
     config_dir: Path
     nats: NatsConfig | None
+    profile_startup: bool
     sentry_dsn: str | None
+    sentry_traces_sample_rate: float | None
     state: StateConfig
+    telegram_http: TelegramHttpConfig
     telegram_token: str
 
+    @property
+    def is_tracing_enabled(self) -> bool:
+        return bool(self.sentry_dsn and self.sentry_traces_sample_rate)
+
     @classmethod
     def from_env(cls, env: Env) -> Self:
         return cls(
             app_version=env.get_string("app-version", default="dirty"),
             config_dir=Path(env.get_string("config-dir", default="config")),
             nats=NatsConfig.from_env(env / "nats", is_optional=True),
+            profile_startup=env.get_bool("profile-startup", default=False),
             sentry_dsn=env.get_string("sentry-dsn"),
+            sentry_traces_sample_rate=_get_float(env, "sentry-traces-sample-rate"),
             state=StateConfig.from_env(env / "state"),
+            telegram_http=TelegramHttpConfig.from_env(env / "telegram-http"),
             telegram_token=env.get_string("telegram-api-key", required=True),
         )
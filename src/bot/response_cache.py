@@ -0,0 +1,54 @@
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Hashable
+    from datetime import datetime, timedelta
+
+
+@dataclass
+class CachedResponse:
+    # None if there was nothing to respond with
+    text: str | None
+    last_sent: datetime | None = None
+
+    def was_sent_within(self, window: timedelta, now: datetime) -> bool:
+        last_sent = self.last_sent
+        return last_sent is not None and abs(now - last_sent) < window
+
+
+class ResponseCache[S: Hashable, K: Hashable]:
+    """Caches rendered command responses until the data they're based on changes.
+
+    Responses are grouped by a scope (e.g. a chat ID), which is the unit of
+    invalidation. Within a scope, responses are identified by a key describing
+    the request (e.g. the requested date range).
+    """
+
+    def __init__(self, *, max_entries_per_scope: int = 32) -> None:
+        self._max_entries_per_scope = max_entries_per_scope
+        self._responses_by_scope: dict[S, dict[K, CachedResponse]] = {}
+
+    def invalidate(self, scope: S) -> None:
+        self._responses_by_scope.pop(scope, None)
+
+    def get(
+        self,
+        scope: S,
+        key: K,
+        render: Callable[[], str | None],
+    ) -> CachedResponse:
+        responses = self._responses_by_scope.get(scope)
+        if responses is None:
+            responses = {}
+            self._responses_by_scope[scope] = responses
+
+        response = responses.get(key)
+        if response is None:
+            if len(responses) >= self._max_entries_per_scope:
+                del responses[next(iter(responses))]
+
+            response = CachedResponse(text=render())
+            responses[key] = response
+
+        return response
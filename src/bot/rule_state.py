@@ -4,7 +4,6 @@ import logging
 from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
-from bs_state.implementation import redis_storage
 from pydantic import BaseModel
 
 if TYPE_CHECKING:
@@ -46,6 +45,8 @@ async def _load_state_storage[S: BaseModel](
         return await memory_storage.load(initial_state=initial_state)
     elif redis_config := config.redis:
         _LOG.info("Using Redis state storage")
+        from bs_state.implementation import redis_storage
+
         key = f"{redis_config.username}:rulestate:{rule.name()}"
 
         return await redis_storage.load(
@@ -1,5 +1,84 @@
-from .darts import DartsRule
-from .lemons import LemonRule
-from .premium import PremiumRule
+import logging
+from importlib import import_module
+from typing import TYPE_CHECKING
+
 from .rule import Rule
-from .slash import SlashRule
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from bs_config import Env
+
+    from .banned_media import BannedMediaRule
+    from .darts import DartsRule
+    from .lemons import LemonRule
+    from .premium import PremiumRule
+    from .slash import SlashRule
+
+__all__ = [
+    "BannedMediaRule",
+    "DartsRule",
+    "LemonRule",
+    "PremiumRule",
+    "Rule",
+    "SlashRule",
+    "is_enabled",
+    "load_enabled_rules",
+    "load_rule_class",
+    "rule_names",
+]
+
+_LOG = logging.getLogger(__name__)
+
+# Maps each rule name to the module and class implementing it. Rule modules are
+# only imported once a rule is actually enabled.
+_RULE_CLASS_PATHS: dict[str, tuple[str, str]] = {
+    "banned-media": (".banned_media", "BannedMediaRule"),
+    "darts": (".darts", "DartsRule"),
+    "lemons": (".lemons", "LemonRule"),
+    "premium": (".premium", "PremiumRule"),
+    "command-spam": (".slash", "SlashRule"),
+}
+
+
+def rule_names() -> Iterable[str]:
+    return _RULE_CLASS_PATHS.keys()
+
+
+def load_rule_class(name: str) -> type[Rule]:
+    module_name, class_name = _RULE_CLASS_PATHS[name]
+    module = import_module(module_name, __name__)
+    rule_class: type[Rule] = getattr(module, class_name)
+
+    if rule_class.name() != name:
+        raise ValueError(
+            f"Rule {class_name} is registered as {name} but named {rule_class.name()}"
+        )
+
+    return rule_class
+
+
+def is_enabled(rule_env: Env) -> bool:
+    return bool(rule_env.get_int_list("enabled-chats", default=[]))
+
+
+def load_enabled_rules(rules_env: Env) -> list[Rule]:
+    enabled_rules = []
+    for name in rule_names():
+        rule_env = rules_env / name
+        if not is_enabled(rule_env):
+            _LOG.info("Skipping rule %s without enabled chats", name)
+            continue
+
+        RuleClass = load_rule_class(name)
+        enabled_rules.append(RuleClass(rule_env))  # type: ignore[call-arg]
+
+    return enabled_rules
+
+
+def __getattr__(name: str) -> type[Rule]:
+    for module_name, class_name in _RULE_CLASS_PATHS.values():
+        if class_name == name:
+            return getattr(import_module(module_name, __name__), class_name)
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,250 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from io import BytesIO
+from typing import TYPE_CHECKING, Self, cast
+
+import telegram
+from PIL import Image
+from pydantic import BaseModel
+from telegram.constants import ReactionEmoji
+
+from bot.bktree import BKTree
+from bot.rules.rule import Rule
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    from bs_config import Env
+
+_LOG = logging.getLogger(__name__)
+
+# Perceptual hashes of media that has been checked already, so repeated posts of
+# the same media don't cause repeated downloads.
+_HASH_CACHE_SIZE = 4096
+
+
+@dataclass(frozen=True, kw_only=True)
+class _ChatConfig:
+    deep_check: bool
+
+    @classmethod
+    def from_env(cls, env: Env) -> Self:
+        return cls(
+            deep_check=env.get_bool("deep-check", default=False),
+        )
+
+
+@dataclass(frozen=True, kw_only=True)
+class _Config:
+    config_by_chat_id: Mapping[int, _ChatConfig]
+    admin_user_ids: frozenset[int]
+    file_unique_ids: frozenset[str]
+    perceptual_hashes: frozenset[int]
+    max_distance: int
+
+    @classmethod
+    def from_env(cls, env: Env) -> Self:
+        config_by_chat_id = {}
+        for chat_id in env.get_int_list("enabled-chats", default=[]):
+            config_by_chat_id[chat_id] = _ChatConfig.from_env(env / str(chat_id))
+        return cls(
+            config_by_chat_id=config_by_chat_id,
+            admin_user_ids=frozenset(env.get_int_list("admin-user-ids", default=[])),
+            file_unique_ids=frozenset(
+                env.get_string_list("file-unique-ids", default=[])
+            ),
+            perceptual_hashes=frozenset(
+                int(value, 16)
+                for value in env.get_string_list("perceptual-hashes", default=[])
+            ),
+            max_distance=env.get_int("max-distance", default=6),
+        )
+
+
+class BannedMediaState(BaseModel):
+    file_unique_ids: set[str] = set()
+    perceptual_hashes: list[int] = []
+
+
+@dataclass(frozen=True)
+class _Media:
+    file_unique_ids: frozenset[str]
+    # The smallest available rendition, used for perceptual hashing
+    thumbnail: telegram.PhotoSize | telegram.Sticker | None
+
+
+def _find_media(message: telegram.Message) -> _Media | None:
+    if photo := message.photo:
+        return _Media(
+            file_unique_ids=frozenset(size.file_unique_id for size in photo),
+            thumbnail=min(photo, key=lambda size: size.width * size.height),
+        )
+
+    if sticker := message.sticker:
+        is_static = not (sticker.is_animated or sticker.is_video)
+        return _Media(
+            file_unique_ids=frozenset({sticker.file_unique_id}),
+            thumbnail=sticker.thumbnail or (sticker if is_static else None),
+        )
+
+    if animation := message.animation:
+        return _Media(
+            file_unique_ids=frozenset({animation.file_unique_id}),
+            thumbnail=animation.thumbnail,
+        )
+
+    return None
+
+
+def _difference_hash(image_bytes: bytes) -> int | None:
+    try:
+        with Image.open(BytesIO(image_bytes)) as image:
+            pixels = image.convert("L").resize((9, 8)).tobytes()
+    except OSError as e:
+        _LOG.warning("Could not decode image for perceptual hashing", exc_info=e)
+        return None
+
+    result = 0
+    for row in range(8):
+        for column in range(8):
+            left = pixels[row * 9 + column]
+            right = pixels[row * 9 + column + 1]
+            result = (result << 1) | (left < right)
+
+    return result
+
+
+class BannedMediaRule(Rule[BannedMediaState]):
+    @classmethod
+    def name(cls) -> str:
+        return "banned-media"
+
+    def __init__(self, env: Env) -> None:
+        self._config = _Config.from_env(env)
+        self._hash_index = BKTree(self._config.perceptual_hashes)
+        self._indexed_state_hashes = 0
+        self._hash_by_file_unique_id: dict[str, int | None] = {}
+
+    def initial_state(self) -> BannedMediaState:
+        return BannedMediaState()
+
+    async def __call__(
+        self,
+        *,
+        chat_id: int,
+        message: telegram.Message,
+        is_edited: bool,
+        state: BannedMediaState,
+    ) -> None:
+        config = self._config.config_by_chat_id.get(chat_id)
+        if not config:
+            _LOG.debug("Not enabled in chat %d", chat_id)
+            return
+
+        if message.text and self._is_ban_command(message.text):
+            await self._handle_ban_command(message=message, state=state)
+            return
+
+        media = _find_media(message)
+        if media is None:
+            return
+
+        if self._is_banned_file(media, state):
+            _LOG.info("Deleting banned media in chat %d", chat_id)
+            await message.delete()
+            return
+
+        if not config.deep_check:
+            return
+
+        if await self._is_near_duplicate(media, state):
+            _LOG.info("Deleting near-duplicate of banned media in chat %d", chat_id)
+            await message.delete()
+
+    @staticmethod
+    def _is_ban_command(text: str) -> bool:
+        return text == "/banmedia" or text.startswith("/banmedia@")
+
+    def _is_banned_file(self, media: _Media, state: BannedMediaState) -> bool:
+        return not (
+            media.file_unique_ids.isdisjoint(self._config.file_unique_ids)
+            and media.file_unique_ids.isdisjoint(state.file_unique_ids)
+        )
+
+    async def _is_near_duplicate(
+        self,
+        media: _Media,
+        state: BannedMediaState,
+    ) -> bool:
+        self._update_hash_index(state)
+        if not len(self._hash_index):
+            return False
+
+        perceptual_hash = await self._get_perceptual_hash(media)
+        if perceptual_hash is None:
+            return False
+
+        match = self._hash_index.find(
+            perceptual_hash,
+            max_distance=self._config.max_distance,
+        )
+        return match is not None
+
+    def _update_hash_index(self, state: BannedMediaState) -> None:
+        state_hashes = state.perceptual_hashes
+        if len(state_hashes) < self._indexed_state_hashes:
+            _LOG.info("Perceptual hashes were removed from state, rebuilding index")
+            self._hash_index = BKTree(self._config.perceptual_hashes)
+            self._indexed_state_hashes = 0
+
+        for value in state_hashes[self._indexed_state_hashes :]:
+            self._hash_index.add(value)
+        self._indexed_state_hashes = len(state_hashes)
+
+    async def _get_perceptual_hash(self, media: _Media) -> int | None:
+        thumbnail = media.thumbnail
+        if thumbnail is None:
+            return None
+
+        cache = self._hash_by_file_unique_id
+        file_unique_id = thumbnail.file_unique_id
+        if file_unique_id in cache:
+            return cache[file_unique_id]
+
+        _LOG.debug("Downloading %s for perceptual hashing", file_unique_id)
+        file = await thumbnail.get_file()
+        image_bytes = bytes(await file.download_as_bytearray())
+        perceptual_hash = await asyncio.to_thread(_difference_hash, image_bytes)
+
+        if len(cache) >= _HASH_CACHE_SIZE:
+            del cache[next(iter(cache))]
+        cache[file_unique_id] = perceptual_hash
+
+        return perceptual_hash
+
+    async def _handle_ban_command(
+        self,
+        *,
+        message: telegram.Message,
+        state: BannedMediaState,
+    ) -> None:
+        user = cast(telegram.User, message.from_user)
+        if user.id not in self._config.admin_user_ids:
+            _LOG.debug("Ignoring command for user %s", user.id)
+            return
+
+        target = message.reply_to_message
+        media = _find_media(target) if target else None
+        if target is None or media is None:
+            await message.set_reaction(ReactionEmoji.SHRUG)
+            return
+
+        state.file_unique_ids.update(media.file_unique_ids)
+        perceptual_hash = await self._get_perceptual_hash(media)
+        if perceptual_hash is not None:
+            state.perceptual_hashes.append(perceptual_hash)
+
+        _LOG.info("Banned media %s", sorted(media.file_unique_ids))
+        await target.delete()
+        await message.set_reaction(ReactionEmoji.THUMBS_UP)
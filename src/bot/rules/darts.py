@@ -6,9 +6,10 @@ from typing import TYPE_CHECKING, Self, cast
 from zoneinfo import ZoneInfo
 
 import telegram
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, model_validator
 from telegram.constants import ReactionEmoji
 
+from bot.response_cache import ResponseCache
 from bot.rules.rule import Rule
 
 if TYPE_CHECKING:
@@ -16,14 +17,38 @@ if TYPE_CHECKING:
 
     from bs_config import Env
 
-_DUO_IDS = frozenset({167930454, 389582243})
+# TODO: remove after migration
+_LEGACY_DUO_IDS = (167930454, 389582243)
 _LOG = logging.getLogger(__name__)
+_TIMEZONE = ZoneInfo("Europe/Berlin")
+
+
+def _local_date(time: datetime) -> date:
+    return time.astimezone(_TIMEZONE).date()
+
+
+@dataclass(frozen=True, kw_only=True)
+class _GroupConfig:
+    name: str
+    member_ids: frozenset[int]
+    start_date: date | None
+
+    @classmethod
+    def from_env(cls, name: str, env: Env) -> Self:
+        start_date = env.get_string("start-date")
+        return cls(
+            name=name,
+            member_ids=frozenset(env.get_int_list("members", default=[])),
+            start_date=date.fromisoformat(start_date) if start_date else None,
+        )
 
 
 @dataclass(frozen=True, kw_only=True)
 class _ChatConfig:
     emojis: Sequence[str]
     cooldown: timedelta | None
+    groups: Sequence[_GroupConfig]
+    partner_ids_by_user_id: Mapping[int, frozenset[int]]
 
     def is_cooled_down(self, last: datetime, now: datetime) -> bool:
         cooldown = self.cooldown
@@ -31,31 +56,51 @@ class _ChatConfig:
             time_diff = abs(now - last)
             return time_diff > cooldown
         else:
-            berlin = ZoneInfo("Europe/Berlin")
-            local_last = last.astimezone(berlin)
-            local_now = now.astimezone(berlin)
+            return _local_date(last) != _local_date(now)
 
-            return local_last.day != local_now.day
+    def get_groups(self, user_id: int) -> list[_GroupConfig]:
+        return [group for group in self.groups if user_id in group.member_ids]
 
     @classmethod
     def from_env(cls, env: Env) -> Self:
+        groups = [
+            _GroupConfig.from_env(name, env / "group" / name)
+            for name in env.get_string_list("groups", default=[])
+        ]
+
+        partner_ids_by_user_id: dict[int, frozenset[int]] = {}
+        for group in groups:
+            for user_id in group.member_ids:
+                partner_ids_by_user_id[user_id] = partner_ids_by_user_id.get(
+                    user_id, frozenset()
+                ) | (group.member_ids - {user_id})
+
         return cls(
             emojis=env.get_string_list("emojis", default=[]),
             cooldown=env.get_duration("cooldown"),
+            groups=groups,
+            partner_ids_by_user_id=partner_ids_by_user_id,
         )
 
 
 @dataclass(frozen=True, kw_only=True)
 class _Config:
     config_by_chat_id: Mapping[int, _ChatConfig]
+    # Repeated identical stats requests within this window only get a reaction
+    stats_coalesce_window: timedelta
 
     @classmethod
     def from_env(cls, env: Env) -> Self:
         config_by_chat_id = {}
         for chat_id in env.get_int_list("enabled-chats", default=[]):
             config_by_chat_id[chat_id] = _ChatConfig.from_env(env / str(chat_id))
+
+        stats_coalesce_window = env.get_duration("stats-coalesce-window")
         return cls(
             config_by_chat_id=config_by_chat_id,
+            stats_coalesce_window=timedelta(minutes=1)
+            if stats_coalesce_window is None
+            else stats_coalesce_window,
         )
 
 
@@ -66,9 +111,17 @@ class DartResult:
     result: int | None
 
 
+@dataclass(frozen=True)
+class _Period:
+    # None means since the start of the recording
+    start: date | None
+    end: date
+
+
 class LastDarts(BaseModel):
     dart_result_by_user_id: dict[int, int] = {}
     dart_time_by_user_id: dict[int, datetime] = {}
+    name_by_user_id: dict[int, str] = {}
 
     def get_darts(self, user_id: int) -> DartResult | None:
         time = self.dart_time_by_user_id.get(user_id)
@@ -79,25 +132,122 @@ class LastDarts(BaseModel):
         return DartResult(time=time, result=result)
 
 
+# TODO: remove after migration
 class DuoStats(BaseModel):
     count_same: int = 1
     count_different: int = 0
 
 
+class DailyCounts(BaseModel):
+    """Per-day counts, indexed by the number of days since first_day."""
+
+    first_day: date | None = None
+    same: list[int] = []
+    different: list[int] = []
+
+    def add(self, day: date, *, is_same: bool) -> None:
+        first_day = self.first_day
+        if first_day is None:
+            first_day = self.first_day = day
+        elif day < first_day:
+            padding = [0] * (first_day - day).days
+            self.same[:0] = padding
+            self.different[:0] = padding
+            first_day = self.first_day = day
+
+        index = (day - first_day).days
+        if index >= len(self.same):
+            padding = [0] * (index + 1 - len(self.same))
+            self.same.extend(padding)
+            self.different.extend(padding)
+
+        if is_same:
+            self.same[index] += 1
+        else:
+            self.different[index] += 1
+
+    def sum(self, *, start: date, end: date) -> tuple[int, int]:
+        first_day = self.first_day
+        if first_day is None:
+            return 0, 0
+
+        start_index = max(0, (start - first_day).days)
+        end_index = max(0, (end - first_day).days + 1)
+        return (
+            sum(self.same[start_index:end_index]),
+            sum(self.different[start_index:end_index]),
+        )
+
+
+class PairStats(BaseModel):
+    # Totals include counts recorded before daily counts were introduced
+    count_same: int = 0
+    count_different: int = 0
+    daily: DailyCounts = Field(default_factory=DailyCounts)
+
+    def add(self, day: date, *, is_same: bool) -> None:
+        if is_same:
+            self.count_same += 1
+        else:
+            self.count_different += 1
+        self.daily.add(day, is_same=is_same)
+
+    def get_counts(self, period: _Period) -> tuple[int, int]:
+        if period.start is None:
+            return self.count_same, self.count_different
+
+        return self.daily.sum(start=period.start, end=period.end)
+
+
+def _pair_key(user_id: int, other_id: int) -> str:
+    low, high = sorted((user_id, other_id))
+    return f"{low}:{high}"
+
+
 class DartsState(BaseModel):
     last_darts_by_chat_id: dict[int, LastDarts] = {}
+    # TODO: remove after migration
     duo_stats_by_chat_id: dict[int, DuoStats] = {}
+    pair_stats_by_chat_id: dict[int, dict[str, PairStats]] = {}
+
+    @model_validator(mode="after")
+    def _migrate_duo_stats(self) -> Self:
+        pair_key = _pair_key(*_LEGACY_DUO_IDS)
+        for chat_id, duo_stats in self.duo_stats_by_chat_id.items():
+            pair_stats = self.pair_stats_by_chat_id.setdefault(chat_id, {})
+            if pair_key not in pair_stats:
+                pair_stats[pair_key] = PairStats(
+                    count_same=duo_stats.count_same,
+                    count_different=duo_stats.count_different,
+                )
+        self.duo_stats_by_chat_id = {}
+        return self
 
     def get_last_dart(self, *, chat_id: int, user_id: int) -> DartResult | None:
         last_darts = self.last_darts_by_chat_id.get(chat_id, LastDarts())
         return last_darts.get_darts(user_id)
 
-    def get_duo_stats(self, *, chat_id: int) -> DuoStats:
-        stats = self.duo_stats_by_chat_id.get(chat_id)
-
+    def get_name(self, *, chat_id: int, user_id: int) -> str:
+        last_darts = self.last_darts_by_chat_id.get(chat_id, LastDarts())
+        return last_darts.name_by_user_id.get(user_id, str(user_id))
+
+    def find_pair_stats(
+        self, *, chat_id: int, user_id: int, other_id: int
+    ) -> PairStats | None:
+        stats_by_pair = self.pair_stats_by_chat_id.get(chat_id, {})
+        return stats_by_pair.get(_pair_key(user_id, other_id))
+
+    def get_pair_stats(self, *, chat_id: int, user_id: int, other_id: int) -> PairStats:
+        stats_by_pair = self.pair_stats_by_chat_id.get(chat_id)
+        if stats_by_pair is None:
+            stats_by_pair = {}
+            self.pair_stats_by_chat_id[chat_id] = stats_by_pair
+
+        key = _pair_key(user_id, other_id)
+        stats = stats_by_pair.get(key)
         if stats is None:
-            stats = DuoStats()
-            self.duo_stats_by_chat_id[chat_id] = stats
+            stats = PairStats()
+            stats_by_pair[key] = stats
 
         return stats
 
@@ -106,9 +256,11 @@ class DartsState(BaseModel):
         *,
         chat_id: int,
         user_id: int,
+        name: str,
         time: datetime,
         result: int,
-    ) -> None:
+    ) -> bool:
+        """Records the user's latest dart and returns whether their name changed."""
         last_darts = self.last_darts_by_chat_id.get(chat_id)
         if last_darts is None:
             last_darts = LastDarts()
@@ -116,6 +268,9 @@ class DartsState(BaseModel):
 
         last_darts.dart_time_by_user_id[user_id] = time
         last_darts.dart_result_by_user_id[user_id] = result
+        previous_name = last_darts.name_by_user_id.get(user_id)
+        last_darts.name_by_user_id[user_id] = name
+        return previous_name != name
 
 
 class DartsRule(Rule[DartsState]):
@@ -125,6 +280,9 @@ class DartsRule(Rule[DartsState]):
 
     def __init__(self, env: Env) -> None:
         self._config = self._load_config(env)
+        self._stats_cache: ResponseCache[int, tuple[tuple[str, ...], _Period, date]] = (
+            ResponseCache()
+        )
 
     @staticmethod
     def _load_config(env: Env) -> _Config:
@@ -154,16 +312,36 @@ class DartsRule(Rule[DartsState]):
         return False
 
     @staticmethod
-    def is_command(*, command_name: str, message: str) -> bool:
-        is_command = message.startswith("/")
-        if not is_command:
-            return False
+    def parse_command(*, command_name: str, message: str) -> list[str] | None:
+        if not message.startswith("/"):
+            return None
 
-        parts = message.split(maxsplit=1)
-        if len(parts) != 1:
-            raise ValueError("Did not expect args")
+        command, *args = message.split()
+        if command != f"/{command_name}" and not command.startswith(
+            f"/{command_name}@"
+        ):
+            return None
 
-        return message == f"/{command_name}" or message.startswith(f"/{command_name}@")
+        return args
+
+    @staticmethod
+    def _parse_period(args: Sequence[str], today: date) -> _Period:
+        match args:
+            case []:
+                return _Period(start=None, end=today)
+            case [days]:
+                day_count = int(days)
+                if not 1 <= day_count <= (today - date.min).days + 1:
+                    raise ValueError(f"Invalid day count {day_count}")
+                return _Period(start=today - timedelta(days=day_count - 1), end=today)
+            case [start, end]:
+                start_date = date.fromisoformat(start)
+                end_date = date.fromisoformat(end)
+                if end_date < start_date:
+                    raise ValueError("End is before start")
+                return _Period(start=start_date, end=end_date)
+            case _:
+                raise ValueError(f"Unexpected args: {args}")
 
     async def __call__(
         self,
@@ -189,16 +367,25 @@ class DartsRule(Rule[DartsState]):
             return
 
         if text := message.text:
+            args = self.parse_command(command_name="stats", message=text)
+            if args is None:
+                return
+
+            today = datetime.now(tz=_TIMEZONE).date()
             try:
-                is_command = self.is_command(command_name="stats", message=text)
+                period = self._parse_period(args, today)
             except ValueError as e:
                 _LOG.info("Received invalid command: %s", e)
                 await message.set_reaction(ReactionEmoji.SHRUG)
             else:
-                if is_command:
-                    await self._handle_stats_command(
-                        chat_id=chat_id, message=message, state=state
-                    )
+                await self._handle_stats_command(
+                    chat_id=chat_id,
+                    config=config,
+                    message=message,
+                    state=state,
+                    period=period,
+                    today=today,
+                )
 
     async def _handle_dice_message(
         self,
@@ -225,59 +412,141 @@ class DartsRule(Rule[DartsState]):
             await message.delete()
             return
 
-        state.put_dart(
+        is_name_changed = state.put_dart(
             chat_id=chat_id,
             user_id=user_id,
+            name=username,
             time=message_time,
             result=dice.value,
         )
+        if is_name_changed:
+            # Cached stats of larger groups include member names
+            self._stats_cache.invalidate(chat_id)
 
-        duo_ids = list(_DUO_IDS)
-        if user_id not in duo_ids:
+        partner_ids = config.partner_ids_by_user_id.get(user_id)
+        if not partner_ids:
             return
 
-        duo_ids.remove(user_id)
-        other_id = duo_ids[0]
-        other_result = state.get_last_dart(chat_id=chat_id, user_id=other_id)
-
-        if other_result is None or config.is_cooled_down(
-            last=other_result.time, now=message_time
-        ):
-            _LOG.debug("Not tracking stats as duo isn't complete today")
-            return
-
-        stats = state.get_duo_stats(chat_id=chat_id)
-        if other_result.result == dice.value:
-            stats.count_same += 1
-        else:
-            stats.count_different += 1
+        day = _local_date(message_time)
+        for partner_id in partner_ids:
+            partner_result = state.get_last_dart(chat_id=chat_id, user_id=partner_id)
+            if partner_result is None or config.is_cooled_down(
+                last=partner_result.time, now=message_time
+            ):
+                _LOG.debug("Not tracking stats as %d didn't throw", partner_id)
+                continue
+
+            stats = state.get_pair_stats(
+                chat_id=chat_id, user_id=user_id, other_id=partner_id
+            )
+            stats.add(day, is_same=partner_result.result == dice.value)
+            self._stats_cache.invalidate(chat_id)
 
     async def _handle_stats_command(
-        self, *, chat_id: int, message: telegram.Message, state: DartsState
+        self,
+        *,
+        chat_id: int,
+        config: _ChatConfig,
+        message: telegram.Message,
+        state: DartsState,
+        period: _Period,
+        today: date,
     ) -> None:
         user = cast(telegram.User, message.from_user)
-        if user.id not in _DUO_IDS:
+        groups = config.get_groups(user.id)
+        if not groups:
             _LOG.debug("Ignoring command for user %s", user.id)
             await message.delete()
             return
 
-        start_date = date(2025, 9, 26)
-        today = datetime.now(tz=ZoneInfo("Europe/Berlin")).date()
-        days_observed = (today - start_date).days + 1
-
-        stats = state.get_duo_stats(chat_id=chat_id)
-        days_with_stats = stats.count_same + stats.count_different
-        if days_with_stats == 0:
+        def _render() -> str | None:
+            texts = [
+                text
+                for group in groups
+                if (
+                    text := self._render_group_stats(
+                        chat_id=chat_id,
+                        group=group,
+                        state=state,
+                        period=period,
+                        today=today,
+                    )
+                )
+            ]
+            return "\n\n".join(texts) or None
+
+        response = self._stats_cache.get(
+            chat_id,
+            (tuple(group.name for group in groups), period, today),
+            _render,
+        )
+        if response.text is None:
             await message.set_reaction(ReactionEmoji.SHRUG)
             return
 
-        quota = stats.count_same / days_with_stats
+        now = message.date
+        if response.was_sent_within(self._config.stats_coalesce_window, now):
+            _LOG.debug("Stats were sent recently, only reacting")
+            await message.set_reaction(ReactionEmoji.EYES)
+            return
 
-        response = StringIO()
-        response.write(f"Tage seit Start der Erfassung: {days_observed}\n")
-        response.write(f"Tage mit Würfen von beiden: {days_with_stats}\n")
-        response.write(f"🤝-Quote: {quota * 100.0:.1f}%\n")
-        if quota < (1.0 / 6.0):
-            response.write("\nL")
+        await message.reply_text(response.text)
+        response.last_sent = now
 
-        await message.reply_text(response.getvalue())
+    @staticmethod
+    def _render_group_stats(
+        *,
+        chat_id: int,
+        group: _GroupConfig,
+        state: DartsState,
+        period: _Period,
+        today: date,
+    ) -> str | None:
+        member_ids = sorted(group.member_ids)
+        counts_by_pair = {}
+        for index, user_id in enumerate(member_ids):
+            for other_id in member_ids[index + 1 :]:
+                stats = state.find_pair_stats(
+                    chat_id=chat_id, user_id=user_id, other_id=other_id
+                )
+                if stats is None:
+                    continue
+
+                same, different = stats.get_counts(period)
+                if same + different:
+                    counts_by_pair[user_id, other_id] = same, different
+
+        if not counts_by_pair:
+            return None
+
+        response = StringIO()
+        is_duo = len(member_ids) == 2
+        if not is_duo:
+            response.write(f"{group.name}\n")
+
+        if period.start is not None:
+            response.write(f"Zeitraum: {period.start} bis {period.end}\n")
+        elif group.start_date is not None:
+            days_observed = (today - group.start_date).days + 1
+            response.write(f"Tage seit Start der Erfassung: {days_observed}\n")
+
+        if is_duo:
+            [(same, different)] = counts_by_pair.values()
+            days_with_stats = same + different
+            quota = same / days_with_stats
+            response.write(f"Tage mit Würfen von beiden: {days_with_stats}\n")
+            response.write(f"🤝-Quote: {quota * 100.0:.1f}%\n")
+            if quota < (1.0 / 6.0):
+                response.write("\nL")
+        else:
+            for (user_id, other_id), (same, different) in counts_by_pair.items():
+                user_name = state.get_name(chat_id=chat_id, user_id=user_id)
+                other_name = state.get_name(chat_id=chat_id, user_id=other_id)
+                days_with_stats = same + different
+                quota = same / days_with_stats
+                response.write(
+                    f"{user_name} & {other_name}: 🤝-Quote {quota * 100.0:.1f}%"
+                    f" an {days_with_stats} Tagen\n"
+                )
+
+        return response.getvalue().rstrip()
@@ -0,0 +1,59 @@
+import logging
+import resource
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+_LOG = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, kw_only=True)
+class _Phase:
+    name: str
+    duration: float
+    imported_modules: int
+
+
+@dataclass
+class StartupProfile:
+    start: float = field(default_factory=time.perf_counter)
+    initial_modules: int = field(default_factory=lambda: len(sys.modules))
+    phases: list[_Phase] = field(default_factory=list)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        modules_before = len(sys.modules)
+        try:
+            yield
+        finally:
+            self.phases.append(
+                _Phase(
+                    name=name,
+                    duration=time.perf_counter() - start,
+                    imported_modules=len(sys.modules) - modules_before,
+                )
+            )
+
+    def report(self) -> None:
+        for phase in self.phases:
+            _LOG.info(
+                "Startup phase %s took %.1f ms (%d modules imported)",
+                phase.name,
+                phase.duration * 1000,
+                phase.imported_modules,
+            )
+
+        _LOG.info(
+            "Startup took %.1f ms in total, %d modules loaded (%d before main),"
+            " max RSS %d KiB",
+            (time.perf_counter() - self.start) * 1000,
+            len(sys.modules),
+            self.initial_modules,
+            resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        )
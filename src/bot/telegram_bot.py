@@ -3,6 +3,7 @@ import logging
 import signal
 from typing import TYPE_CHECKING, Any
 
+import httpx
 import telegram
 from bs_nats_updater import create_updater
 from telegram.ext import (
@@ -12,18 +13,56 @@ from telegram.ext import (
     filters,
 )
 
+from bot.tracing import ReceiveTimes, Tracer, TracingHTTPXRequest
+
 if TYPE_CHECKING:
-    from bot.config import Config
+    from bot.config import Config, HttpPoolConfig
     from bot.rule_state import RuleState
 
 _LOG = logging.getLogger(__name__)
 
 
+def create_request(
+    config: HttpPoolConfig,
+    *,
+    tracer: Tracer,
+) -> TracingHTTPXRequest:
+    return TracingHTTPXRequest(
+        tracer,
+        connection_pool_size=config.pool_size,
+        connect_timeout=config.connect_timeout,
+        read_timeout=config.read_timeout,
+        write_timeout=config.write_timeout,
+        pool_timeout=config.pool_timeout,
+        http_version=config.http_version,
+        httpx_kwargs={
+            "limits": httpx.Limits(
+                max_connections=config.pool_size,
+                max_keepalive_connections=config.keepalive_connections,
+                keepalive_expiry=config.keepalive_expiry,
+            ),
+        },
+    )
+
+
 class TelegramBot:
     def __init__(self, config: Config, rule_states: list[RuleState]) -> None:
         self.config = config
         self.rule_states = rule_states
-        self.bot = telegram.Bot(token=config.telegram_token)
+        self.tracer = Tracer(enabled=config.is_tracing_enabled)
+        self.receive_times = ReceiveTimes()
+        http_config = config.telegram_http
+        self.bot = telegram.Bot(
+            token=config.telegram_token,
+            request=create_request(
+                http_config.actions,
+                tracer=self.tracer,
+            ),
+            get_updates_request=create_request(
+                http_config.updates,
+                tracer=self.tracer,
+            ),
+        )
 
     async def run(self) -> None:
         if nats_config := self.config.nats:
@@ -35,6 +74,9 @@ class TelegramBot:
             _LOG.warning("Using non-NATS updater")
             updater = Updater(self.bot, asyncio.Queue())
 
+        if self.tracer.enabled:
+            self.receive_times.attach(updater.update_queue)
+
         app: Application = (
             Application.builder()
             .updater(updater)  # type: ignore[arg-type]
@@ -79,14 +121,23 @@ class TelegramBot:
             _LOG.error("Received non-message update: %s", update.to_json())
             return
 
+        with self.tracer.update_transaction(
+            update,
+            received_at=self.receive_times.pop(update.update_id),
+        ):
+            await self._apply_rules(message, is_edited=message_is_edited)
+
+    async def _apply_rules(self, message: telegram.Message, *, is_edited: bool) -> None:
         chat_id = message.chat_id
+        tracer = self.tracer
 
         for rule_state in self.rule_states:
             rule = rule_state.rule
             _LOG.debug("Loading state for rule %s", rule.name())
             state_storage = rule_state.state_storage
             if state_storage is not None:
-                state = await state_storage.load()
+                with tracer.span(op="state.load", name=rule.name()):
+                    state = await state_storage.load()
                 old_state = state.model_copy(deep=True)
             else:
                 state = None
@@ -94,15 +145,17 @@ class TelegramBot:
 
             _LOG.debug("Passing message to rule %s", rule.name())
             try:
-                await rule(
-                    chat_id=chat_id,
-                    message=message,
-                    is_edited=message_is_edited,
-                    state=state,
-                )
+                with tracer.span(op="rule", name=rule.name()):
+                    await rule(
+                        chat_id=chat_id,
+                        message=message,
+                        is_edited=is_edited,
+                        state=state,
+                    )
             except Exception as e:
                 _LOG.error("Rule threw an exception", exc_info=e)
             else:
                 if state_storage is not None and (True or old_state != state):
                     _LOG.debug("Storing state for rule %s", rule.name())
-                    await state_storage.store(state)
+                    with tracer.span(op="state.store", name=rule.name()):
+                        await state_storage.store(state)
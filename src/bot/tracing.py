@@ -0,0 +1,128 @@
+import time
+from contextlib import contextmanager, nullcontext
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING, Any
+
+import telegram
+from telegram.request import HTTPXRequest
+
+if TYPE_CHECKING:
+    import asyncio
+    from collections.abc import Iterator
+    from contextlib import AbstractContextManager
+
+
+class ReceiveTimes:
+    """Remembers when updates were put into the update queue.
+
+    The update queue is filled by the (NATS) updater as soon as an update is
+    received, so the time between that and the handler being invoked is the time
+    the update spent waiting in our process.
+    """
+
+    def __init__(self, max_size: int = 1024) -> None:
+        self._max_size = max_size
+        self._time_by_update_id: dict[int, float] = {}
+
+    def attach(self, queue: asyncio.Queue[Any]) -> None:
+        # The updater may hold its own reference to the queue, so we hook into
+        # the existing instance instead of replacing it. Queue.put() delegates to
+        # put_nowait(), so this covers both.
+        put_nowait = queue.put_nowait
+
+        def _put_nowait(item: Any) -> None:
+            if isinstance(item, telegram.Update):
+                self._record(item.update_id)
+            put_nowait(item)
+
+        queue.put_nowait = _put_nowait  # type: ignore[method-assign]
+
+    def _record(self, update_id: int) -> None:
+        times = self._time_by_update_id
+        if len(times) >= self._max_size:
+            # Updates that never reach our handler would pile up otherwise
+            del times[next(iter(times))]
+        times[update_id] = time.time()
+
+    def pop(self, update_id: int) -> float | None:
+        return self._time_by_update_id.pop(update_id, None)
+
+
+class Tracer:
+    def __init__(self, *, enabled: bool) -> None:
+        self.enabled = enabled
+
+    @contextmanager
+    def update_transaction(
+        self,
+        update: telegram.Update,
+        *,
+        received_at: float | None,
+    ) -> Iterator[None]:
+        if not self.enabled:
+            yield
+            return
+
+        import sentry_sdk
+
+        handler_start = time.time()
+        with sentry_sdk.start_transaction(
+            op="telegram.update",
+            name="handle update",
+            start_timestamp=received_at,
+        ) as transaction:
+            transaction.set_data("update_id", update.update_id)
+            if chat := update.effective_chat:
+                transaction.set_data("chat_id", chat.id)
+
+            if received_at is not None:
+                queue_span = transaction.start_child(
+                    op="queue.wait",
+                    name="update queue",
+                    start_timestamp=received_at,
+                )
+                queue_span.finish(end_timestamp=handler_start)
+                transaction.set_data(
+                    "queue.delay_ms",
+                    (handler_start - received_at) * 1000,
+                )
+
+            if message := update.effective_message:
+                sent_at = (message.edit_date or message.date).timestamp()
+                transaction.set_data(
+                    "telegram.delay_ms",
+                    ((received_at or handler_start) - sent_at) * 1000,
+                )
+
+            try:
+                yield
+            finally:
+                # The transaction may have been started in the past, so we can't
+                # let Sentry derive its end from the time it was created.
+                transaction.finish(end_timestamp=datetime.now(tz=UTC))
+
+    def span(self, *, op: str, name: str) -> AbstractContextManager[Any]:
+        if not self.enabled:
+            return nullcontext()
+
+        import sentry_sdk
+
+        return sentry_sdk.start_span(op=op, name=name)
+
+
+class TracingHTTPXRequest(HTTPXRequest):
+    def __init__(self, tracer: Tracer, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self._tracer = tracer
+
+    async def do_request(
+        self,
+        url: str,
+        method: str,
+        *args: Any,
+        **kwargs: Any,
+    ) -> tuple[int, bytes]:
+        # The URL contains the bot token, so only the API method name is recorded
+        api_method = url.rsplit("/", maxsplit=1)[-1]
+        with self._tracer.span(op="telegram.api", name=api_method):
+            return await super().do_request(url, method, *args, **kwargs)
@@ -0,0 +1,122 @@
+import asyncio
+from io import BytesIO
+from typing import TYPE_CHECKING, Any, Self, cast
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+import telegram
+from PIL import Image
+
+from bot.rules.banned_media import BannedMediaRule, BannedMediaState
+
+if TYPE_CHECKING:
+    from bs_config import Env
+
+_CHAT_ID = -100
+
+
+class _DictEnv:
+    def __init__(self, values: dict[str, Any]) -> None:
+        self._values = values
+
+    def __truediv__(self, key: str) -> Self:
+        return type(self)(self._values.get(key, {}))
+
+    def get_bool(self, key: str, *, default: bool) -> bool:
+        return self._values.get(key, default)
+
+    def get_int(self, key: str, *, default: int) -> int:
+        return self._values.get(key, default)
+
+    def get_int_list(self, key: str, *, default: list[int]) -> list[int]:
+        return self._values.get(key, default)
+
+    def get_string_list(self, key: str, *, default: list[str]) -> list[str]:
+        return self._values.get(key, default)
+
+
+def _image_bytes() -> bytes:
+    image = Image.linear_gradient("L").resize((90, 90))
+    buffer = BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _create_rule(*, deep_check: bool) -> BannedMediaRule:
+    env = _DictEnv(
+        {
+            "enabled-chats": [_CHAT_ID],
+            str(_CHAT_ID): {"deep-check": deep_check},
+            "file-unique-ids": ["banned"],
+            # Hash of the gradient returned by _image_bytes
+            "perceptual-hashes": ["0"],
+        }
+    )
+    return BannedMediaRule(cast("Env", env))
+
+
+def _photo_message() -> telegram.Message:
+    return telegram.Message.de_json(
+        {
+            "message_id": 1,
+            "date": 0,
+            "chat": {"id": _CHAT_ID, "type": "supergroup"},
+            "from": {"id": 1, "is_bot": False, "first_name": "User"},
+            "photo": [
+                {
+                    "file_id": "other",
+                    "file_unique_id": "other",
+                    "width": 90,
+                    "height": 90,
+                }
+            ],
+        },
+        None,
+    )
+
+
+@pytest.fixture
+def get_file(monkeypatch: pytest.MonkeyPatch) -> AsyncMock:
+    file = MagicMock()
+    file.download_as_bytearray = AsyncMock(return_value=bytearray(_image_bytes()))
+    mock = AsyncMock(return_value=file)
+    monkeypatch.setattr(telegram.PhotoSize, "get_file", mock)
+    return mock
+
+
+@pytest.fixture
+def delete(monkeypatch: pytest.MonkeyPatch) -> AsyncMock:
+    mock = AsyncMock()
+    monkeypatch.setattr(telegram.Message, "delete", mock)
+    return mock
+
+
+def _call(rule: BannedMediaRule) -> None:
+    asyncio.run(
+        rule(
+            chat_id=_CHAT_ID,
+            message=_photo_message(),
+            is_edited=False,
+            state=BannedMediaState(),
+        )
+    )
+
+
+def test_file_unique_id_miss_does_not_download(
+    get_file: AsyncMock,
+    delete: AsyncMock,
+) -> None:
+    _call(_create_rule(deep_check=False))
+
+    get_file.assert_not_awaited()
+    delete.assert_not_awaited()
+
+
+def test_file_unique_id_miss_downloads_with_deep_check(
+    get_file: AsyncMock,
+    delete: AsyncMock,
+) -> None:
+    _call(_create_rule(deep_check=True))
+
+    get_file.assert_awaited_once()
+    delete.assert_awaited_once()
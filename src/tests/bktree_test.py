@@ -0,0 +1,46 @@
+import random
+
+import pytest
+
+from bot.bktree import BKTree, hamming_distance
+
+
+@pytest.fixture
+def values() -> list[int]:
+    rng = random.Random(42)
+    return [rng.getrandbits(64) for _ in range(2000)]
+
+
+def test_empty() -> None:
+    assert BKTree().find(0, max_distance=64) is None
+
+
+def test_deduplicates(values: list[int]) -> None:
+    tree = BKTree(values + values)
+    assert len(tree) == len(set(values))
+
+
+def test_finds_exact(values: list[int]) -> None:
+    tree = BKTree(values)
+    for value in values[:50]:
+        assert tree.find(value, max_distance=0) == value
+
+
+@pytest.mark.parametrize("max_distance", [0, 4, 12, 24])
+def test_matches_linear_scan(values: list[int], max_distance: int) -> None:
+    tree = BKTree(values)
+    rng = random.Random(max_distance)
+    for value in values[:100]:
+        query = value
+        for bit in rng.sample(range(64), k=3):
+            query ^= 1 << bit
+
+        expected = min(values, key=lambda v: hamming_distance(v, query))
+        expected_distance = hamming_distance(expected, query)
+        found = tree.find(query, max_distance=max_distance)
+
+        if expected_distance > max_distance:
+            assert found is None
+        else:
+            assert found is not None
+            assert hamming_distance(found, query) == expected_distance
@@ -0,0 +1,63 @@
+from datetime import UTC, date, datetime
+
+import pytest
+
+from bot.rules.darts import DailyCounts, DartsRule, DartsState
+
+
+def test_daily_counts_sum() -> None:
+    counts = DailyCounts()
+    counts.add(date(2025, 10, 3), is_same=True)
+    counts.add(date(2025, 10, 5), is_same=False)
+    counts.add(date(2025, 10, 1), is_same=False)
+    counts.add(date(2025, 10, 5), is_same=True)
+
+    assert counts.first_day == date(2025, 10, 1)
+    assert counts.sum(start=date(2025, 9, 1), end=date(2025, 12, 1)) == (2, 2)
+    assert counts.sum(start=date(2025, 10, 2), end=date(2025, 10, 4)) == (1, 0)
+    assert counts.sum(start=date(2025, 10, 5), end=date(2025, 10, 5)) == (1, 1)
+    assert counts.sum(start=date(2025, 10, 6), end=date(2025, 10, 9)) == (0, 0)
+    assert counts.sum(start=date(2025, 9, 1), end=date(2025, 9, 30)) == (0, 0)
+
+
+def test_pair_stats_are_shared_by_both_users() -> None:
+    state = DartsState()
+    state.get_pair_stats(chat_id=1, user_id=2, other_id=3).add(
+        date(2025, 10, 1), is_same=True
+    )
+
+    stats = state.find_pair_stats(chat_id=1, user_id=3, other_id=2)
+    assert stats is not None
+    assert (stats.count_same, stats.count_different) == (1, 0)
+    assert state.find_pair_stats(chat_id=1, user_id=2, other_id=4) is None
+
+
+def test_migrates_duo_stats() -> None:
+    state = DartsState.model_validate(
+        {"duo_stats_by_chat_id": {"-100": {"count_same": 4, "count_different": 9}}}
+    )
+
+    assert not state.duo_stats_by_chat_id
+    stats = state.find_pair_stats(chat_id=-100, user_id=167930454, other_id=389582243)
+    assert stats is not None
+    assert (stats.count_same, stats.count_different) == (4, 9)
+    assert stats.daily.first_day is None
+
+
+def test_put_dart_reports_name_changes() -> None:
+    state = DartsState()
+    time = datetime(2025, 10, 1, tzinfo=UTC)
+
+    def put(name: str) -> bool:
+        return state.put_dart(chat_id=1, user_id=2, name=name, time=time, result=3)
+
+    assert put("Alice")
+    assert not put("Alice")
+    assert put("Bob")
+    assert state.get_name(chat_id=1, user_id=2) == "Bob"
+
+
+@pytest.mark.parametrize("days", ["0", "-1", "999999"])
+def test_rejects_invalid_day_counts(days: str) -> None:
+    with pytest.raises(ValueError, match="Invalid day count"):
+        DartsRule._parse_period([days], date(2025, 10, 5))
@@ -0,0 +1,42 @@
+from datetime import UTC, datetime, timedelta
+
+from bot.response_cache import ResponseCache
+
+
+def test_renders_once_until_invalidated() -> None:
+    cache: ResponseCache[int, str] = ResponseCache()
+    render_count = 0
+
+    def _render() -> str:
+        nonlocal render_count
+        render_count += 1
+        return f"render {render_count}"
+
+    assert cache.get(1, "stats", _render).text == "render 1"
+    assert cache.get(1, "stats", _render).text == "render 1"
+    assert cache.get(2, "stats", _render).text == "render 2"
+
+    cache.invalidate(1)
+    assert cache.get(1, "stats", _render).text == "render 3"
+    assert cache.get(2, "stats", _render).text == "render 2"
+
+
+def test_evicts_oldest_entry() -> None:
+    cache: ResponseCache[int, int] = ResponseCache(max_entries_per_scope=2)
+    for key in range(3):
+        cache.get(1, key, lambda: "first")
+
+    assert cache.get(1, 2, lambda: "second").text == "first"
+    assert cache.get(1, 0, lambda: "second").text == "second"
+
+
+def test_was_sent_within() -> None:
+    cache: ResponseCache[int, int] = ResponseCache()
+    response = cache.get(1, 1, lambda: "stats")
+    now = datetime(2025, 10, 1, tzinfo=UTC)
+    window = timedelta(minutes=1)
+
+    assert not response.was_sent_within(window, now)
+    response.last_sent = now
+    assert response.was_sent_within(window, now + timedelta(seconds=30))
+    assert not response.was_sent_within(window, now + timedelta(minutes=2))
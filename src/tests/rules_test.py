@@ -0,0 +1,9 @@
+import pytest
+
+from bot import rules
+
+
+@pytest.mark.parametrize("name", list(rules.rule_names()))
+def test_registered_rule_names(name: str) -> None:
+    rule_class = rules.load_rule_class(name)
+    assert rule_class.name() == name
@@ -0,0 +1,13 @@
+import tomllib
+
+from bot.bench.soak import _synthetic_config
+
+
+def test_synthetic_config_bans_media_in_banned_media_rule() -> None:
+    config = tomllib.loads(_synthetic_config([-100, -101], [1, 2, 3]))
+
+    rule = config["rule"]
+    assert rule["banned-media"]["file-unique-ids"] == ["banned-0"]
+    assert rule["banned-media"]["enabled-chats"] == [-100, -101]
+    assert "file-unique-ids" not in rule["lemons"]
+    assert rule["darts"]["-100"]["group"]["soak"]["members"] == [1, 2, 3]